@@ -6,15 +6,50 @@ This module implements the fundamental building blocks of our minimal workflow e
 - Graph: A container that manages nodes, edges, and orchestrates execution
 - WorkflowEngine: High-level API for creating and executing workflow graphs
 
-We use a queue-based execution model with state passing between nodes,
-supporting both linear workflows and complex branching logic.
+State is passed from node to node. Acyclic graphs are compiled into a generated
+straight-line function that runs nodes in topological order, each once, guarded
+by flags set from its incoming edges; they can also run in concurrent waves.
+Cyclic graphs, and runs from explicit start nodes, use a bounded queue loop.
 """
 
+import asyncio
+import hashlib
+import math
+import os
+import threading
 import uuid
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Generator, Hashable, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+import orjson
+from cachetools import LRUCache
+
+
+_UUID_BATCH = 256
+_uuid_pool: deque = deque()
+
+
+def _fast_uuid() -> str:
+    """Return a random (version 4) UUID string, drawing entropy in batches.
+    
+    uuid.uuid4() reads os.urandom once per call; filling a pool of IDs from one
+    read keeps that syscall off the per-run path. deque operations are atomic,
+    so concurrent callers at worst refill the pool twice.
+    """
+    if not _uuid_pool:
+        buf = os.urandom(16 * _UUID_BATCH)
+        _uuid_pool.extend(
+            str(uuid.UUID(bytes=buf[i:i + 16], version=4))
+            for i in range(0, len(buf), 16)
+        )
+    try:
+        return _uuid_pool.popleft()
+    except IndexError:
+        return str(uuid.uuid4())
+
 
 class NodeStatus(str, Enum):
     """Possible outcomes of node execution: success, error, or skipped."""
@@ -23,7 +58,7 @@ class NodeStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionEntry:
     """Record of a single node's execution in a workflow run."""
     node_name: str
@@ -33,20 +68,176 @@ class ExecutionEntry:
     error_message: Optional[str] = None
 
 
+class CowDict(dict):
+    """Shallow state copy handed to node functions that records whether it was written."""
+    
+    _dirty = False
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._dirty = True
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key: str) -> None:
+        self._dirty = True
+        super().__delitem__(key)
+    
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._dirty = True
+        super().update(*args, **kwargs)
+    
+    def pop(self, *args: Any) -> Any:
+        self._dirty = True
+        return super().pop(*args)
+    
+    def popitem(self) -> Tuple[str, Any]:
+        self._dirty = True
+        return super().popitem()
+    
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._dirty = True
+        return super().setdefault(key, default)
+    
+    def clear(self) -> None:
+        self._dirty = True
+        super().clear()
+    
+    def __ior__(self, other: Any) -> "CowDict":
+        # dict.__ior__ merges in C without calling update
+        self._dirty = True
+        return super().__ior__(other)
+
+
+_JSON_SCALARS = frozenset((str, int, bool, type(None)))
+_JSON_NUMBERS = frozenset((int, float, bool))
+
+
+def _is_plain_json(value: Any) -> bool:
+    """Check that value is built only from dict, list, str, int, bool, None and finite floats.
+    
+    orjson encodes other types as one of these (a tuple as a list, an enum as its
+    value, a datetime or UUID as a string, NaN as null), so their digests would
+    collide with those of different plain values.
+    """
+    value_type = type(value)
+    # A node that wrote to its state hands the next node the CowDict it was given
+    if value_type is dict or value_type is CowDict:
+        return all(type(key) is str and _is_plain_json(item) for key, item in value.items())
+    if value_type is list:
+        item_types = set(map(type, value))
+        if item_types <= _JSON_SCALARS:
+            return True
+        if item_types <= _JSON_NUMBERS:
+            return all(map(math.isfinite, value))
+        return all(map(_is_plain_json, value))
+    if value_type is float:
+        return math.isfinite(value)
+    return value_type in _JSON_SCALARS
+
+
+def _hash_state(state: Dict[str, Any]) -> Optional[bytes]:
+    """Digest the canonical JSON form of a state, or None if it is not plain JSON."""
+    if not _is_plain_json(state):
+        return None
+    try:
+        data = orjson.dumps(state, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        return None
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _changed(old: Any, new: Any) -> bool:
+    """Check whether a state value differs from its snapshot value."""
+    if old is new:
+        return False
+    try:
+        return bool(old != new)
+    except Exception:
+        # Values without a boolean comparison (e.g. arrays) count as changed
+        return True
+
+
+class OutputCache:
+    """Thread-safe LRU store of node outputs keyed by (function, input state digest).
+    
+    Outputs are stored as JSON bytes and decoded on every hit, so each run gets
+    fresh objects and in-place changes to nested values never reach the cache.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        """Initialize an empty cache holding at most maxsize outputs."""
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of the cached output for key, or None on a miss."""
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                return None
+            self._data.move_to_end(key)
+        return orjson.loads(data)
+    
+    def put(self, key: Hashable, output: Dict[str, Any]) -> None:
+        """Store output under key, evicting the least recently used entry.
+        
+        Outputs that are not plain JSON would not decode to equal values, so they
+        are not cached.
+        """
+        if not _is_plain_json(output):
+            return
+        try:
+            data = orjson.dumps(output)
+        except TypeError:
+            return
+        with self._lock:
+            self._data[key] = data
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached outputs."""
+        with self._lock:
+            self._data.clear()
+
+
+# Process-wide cache shared by all memoized nodes, so identical functions in
+# different graphs reuse each other's results
+output_cache = OutputCache()
+
+
 class Node:
     """A single step in a workflow graph that wraps a pure Python function."""
     
-    def __init__(self, name: str, func: Callable, node_type: str = "task"):
+    __slots__ = ("name", "func", "node_type", "memoize", "pure")
+    
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        node_type: str = "task",
+        memoize: bool = False,
+        pure: bool = False
+    ):
         """Initialize a workflow node.
         
         Args:
             name: Unique identifier for this node
             func: Pure Python function (state: Dict) -> Dict
             node_type: Classification of the node (default: "task")
+            memoize: Reuse previous outputs for identical input states; only safe
+                for deterministic functions without side effects. Only states made
+                of plain JSON types (dict with str keys, list, str, int, bool, None,
+                finite float) are cached; any other state runs the function
+            pure: The function never mutates its argument (it returns a new dict
+                instead), so it may be handed the live state without a copy
         """
         self.name = name
         self.func = func
         self.node_type = node_type
+        self.memoize = memoize
+        self.pure = pure
     
     def execute(self, state: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
         """Execute the node function on the given state.
@@ -57,9 +248,32 @@ class Node:
         Returns:
             Tuple of (updated_state, error_message) where error_message is None on success
         """
+        if self.memoize:
+            digest = _hash_state(state)
+            if digest is not None:
+                key = (self.func, digest)
+                cached = output_cache.get(key)
+                if cached is not None:
+                    return cached, None
+                updated_state, error = self._call(state)
+                if error is None:
+                    output_cache.put(key, updated_state)
+                return updated_state, error
+        return self._call(state)
+    
+    def _call(self, state: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Invoke the node function on a copy of state, capturing any error."""
         try:
-            # Pass a copy to prevent accidental mutations
-            updated_state = self.func(state.copy())
+            if self.pure:
+                return self.func(state), None
+            
+            # Pass a copy to prevent accidental mutations; the caller's dict is never
+            # written, so it can double as the pre-execution snapshot
+            working = CowDict(state)
+            updated_state = self.func(working)
+            if updated_state is working and not working._dirty:
+                # Read-only node: hand back the original dict rather than the copy
+                return state, None
             return updated_state, None
         except Exception as e:
             # Catch and return errors for logging
@@ -69,6 +283,8 @@ class Node:
 class Edge:
     """A directed connection between two nodes, optionally with conditional routing."""
     
+    __slots__ = ("source", "target", "condition")
+    
     def __init__(self, source: str, target: str, condition: Optional[Callable] = None):
         """Create an edge between two nodes.
         
@@ -102,28 +318,52 @@ class Edge:
 class Graph:
     """A workflow represented as a directed graph of nodes and edges."""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, allow_cycles: bool = True):
         """Create a new workflow graph.
         
         Args:
             name: Human-readable name for the workflow
+            allow_cycles: Whether loops are intentional; if False, executing a
+                cyclic graph raises instead of falling back to the bounded loop
         """
-        self.id = str(uuid.uuid4())
+        self.id = _fast_uuid()
         self.name = name
+        self.allow_cycles = allow_cycles
         self.nodes: Dict[str, Node] = {}
         self.edges: Dict[str, List[Edge]] = {}
+        # In-degree per node, maintained incrementally so scheduling needs no edge scan
+        self._indeg: Dict[str, int] = {}
+        # Outgoing edges split by kind, so unconditional fan-out needs no per-edge call
+        self._uncond: Dict[str, List[str]] = {}
+        self._cond: Dict[str, List[Edge]] = {}
+        self._entry_nodes: Optional[List[str]] = None
+        # Execution plan built by finalize(); None until the graph is finalized
+        self._is_dag: Optional[bool] = None
+        self._topo_order: List[str] = []
+        self._compiled: Optional[Callable[..., Generator[ExecutionEntry, None, Dict[str, Any]]]] = None
     
-    def add_node(self, name: str, func: Callable, node_type: str = "task") -> None:
+    def add_node(
+        self,
+        name: str,
+        func: Callable,
+        node_type: str = "task",
+        memoize: bool = False,
+        pure: bool = False
+    ) -> None:
         """Add a node to the graph.
         
         Args:
             name: Unique identifier for this node
             func: The function this node will execute
             node_type: Classification of the node
+            memoize: Cache outputs by input state (deterministic functions only)
+            pure: Skip the defensive state copy (function must not mutate its input)
         """
-        self.nodes[name] = Node(name, func, node_type)
+        self.nodes[name] = Node(name, func, node_type, memoize, pure)
         if name not in self.edges:
             self.edges[name] = []
+        self._indeg.setdefault(name, 0)
+        self._invalidate()
     
     def add_edge(self, source: str, target: str, condition: Optional[Callable] = None) -> None:
         """Connect two nodes with a directed edge.
@@ -142,7 +382,147 @@ class Graph:
         if source not in self.edges:
             self.edges[source] = []
         
-        self.edges[source].append(Edge(source, target, condition))
+        edge = Edge(source, target, condition)
+        self.edges[source].append(edge)
+        if condition is None:
+            self._uncond.setdefault(source, []).append(target)
+        else:
+            self._cond.setdefault(source, []).append(edge)
+        self._indeg[target] += 1
+        self._invalidate()
+    
+    def _invalidate(self) -> None:
+        """Drop structural caches after the graph has been modified."""
+        self._entry_nodes = None
+        self._is_dag = None
+        self._topo_order = []
+        self._compiled = None
+    
+    def _get_entry_nodes(self) -> List[str]:
+        """Get nodes with no incoming edges, cached until the graph changes.
+        
+        Returns:
+            List of entry node names in insertion order
+        """
+        if self._entry_nodes is None:
+            self._entry_nodes = [name for name in self.nodes if self._indeg[name] == 0]
+        return self._entry_nodes
+    
+    def sort_or_cycle(self) -> Tuple[List[str], List[str]]:
+        """Topologically sort the graph, or find a cycle if there is one.
+        
+        Returns:
+            Tuple of (order, cycle): when the graph is acyclic, order lists every
+            node in Kahn order and cycle is empty; otherwise order is empty and
+            cycle is one closed path of node names, e.g. ["a", "b", "a"]
+        """
+        indeg = dict(self._indeg)
+        ready = deque(self._get_entry_nodes())
+        order = []
+        while ready:
+            node_name = ready.popleft()
+            order.append(node_name)
+            for edge in self.edges[node_name]:
+                indeg[edge.target] -= 1
+                if indeg[edge.target] == 0:
+                    ready.append(edge.target)
+        
+        if len(order) == len(self.nodes):
+            return order, []
+        
+        # Every node Kahn could not order has a predecessor that is also unordered,
+        # so walking predecessors from any of them must eventually repeat a node
+        predecessor: Dict[str, str] = {}
+        for source, edges in self.edges.items():
+            if indeg[source] > 0:
+                for edge in edges:
+                    if indeg[edge.target] > 0:
+                        predecessor[edge.target] = source
+        
+        node_name = next(name for name, count in indeg.items() if count > 0)
+        path: List[str] = []
+        seen: Dict[str, int] = {}
+        while node_name not in seen:
+            seen[node_name] = len(path)
+            path.append(node_name)
+            node_name = predecessor[node_name]
+        cycle = path[seen[node_name]:] + [node_name]
+        cycle.reverse()
+        return [], cycle
+    
+    def _is_acyclic(self) -> bool:
+        """Check whether the graph is a DAG, finalizing it first if needed."""
+        if self._is_dag is None:
+            self.finalize()
+        return self._is_dag
+    
+    def finalize(self) -> None:
+        """Build the execution plan for the current graph structure.
+        
+        Runs a topological sort with cycle detection. A DAG is then compiled into a
+        generated straight-line function: nodes are called in topological order,
+        each guarded by a flag that its incoming edges set, so a node runs once
+        after all of its predecessors and only if at least one incoming edge was
+        taken. Cyclic graphs keep the bounded queue loop.
+        Called lazily on first execution; modifying the graph discards the plan.
+        
+        Raises:
+            ValueError: If the graph has a cycle and allow_cycles is False
+        """
+        order, cycle = self.sort_or_cycle()
+        if cycle and not self.allow_cycles:
+            raise ValueError(f"Graph '{self.name}' contains a cycle: {' -> '.join(cycle)}")
+        
+        self._is_dag = not cycle
+        self._topo_order = order
+        self._compiled = None if cycle else self._compile_dag(order)
+    
+    def _compile_dag(
+        self,
+        order: List[str]
+    ) -> Callable[..., Generator[ExecutionEntry, None, Dict[str, Any]]]:
+        """Generate the straight-line run function for a topological order."""
+        index = {name: i for i, name in enumerate(order)}
+        edges: List[Edge] = []
+        entry_nodes = set(self._get_entry_nodes())
+        
+        lines = [
+            "def _run(state, max_iterations):",
+            "    state = state.copy()",
+            "    iteration = 0",
+        ]
+        guarded = [f"a{index[name]}" for name in order if name not in entry_nodes]
+        if guarded:
+            lines.append("    " + " = ".join(guarded) + " = False")
+        
+        for name in order:
+            i = index[name]
+            indent = "    "
+            if name not in entry_nodes:
+                lines.append(f"    if a{i}:")
+                indent = "        "
+            lines += [
+                f"{indent}if iteration >= max_iterations:",
+                f"{indent}    return state",
+                f"{indent}iteration += 1",
+                f"{indent}state, entry = run_node(names[{i}], state)",
+                f"{indent}yield entry",
+            ]
+            for edge in self.edges[name]:
+                flag = f"a{index[edge.target]}"
+                if edge.condition is None:
+                    lines.append(f"{indent}{flag} = True")
+                else:
+                    lines.append(f"{indent}{flag} = {flag} or edges[{len(edges)}].should_execute(state)")
+                    edges.append(edge)
+        if not order:
+            # Keep _run a generator even when the graph has no nodes
+            lines.append("    yield from ()")
+        lines.append("    return state")
+        
+        namespace = {"run_node": self._run_node, "names": order, "edges": edges}
+        exec(compile("\n".join(lines), f"<graph:{self.name}>", "exec"), namespace)
+        return namespace["_run"]
     
     def _get_next_nodes(self, current_node: str, state: Dict[str, Any]) -> List[str]:
         """Get next nodes to execute based on edge conditions.
@@ -152,13 +532,12 @@ class Graph:
             state: Current workflow state
             
         Returns:
-            List of next node names to execute
+            List of next node names to execute, unconditional targets first
         """
-        next_nodes = []
-        if current_node in self.edges:
-            for edge in self.edges[current_node]:
-                if edge.should_execute(state):
-                    next_nodes.append(edge.target)
+        next_nodes = list(self._uncond.get(current_node, ()))
+        next_nodes.extend(
+            edge.target for edge in self._cond.get(current_node, ()) if edge.should_execute(state)
+        )
         return next_nodes
     
     def execute(
@@ -177,23 +556,47 @@ class Graph:
         Returns:
             Tuple of (final_state, execution_log)
         """
+        execution_log: List[ExecutionEntry] = []
+        entries = self.iter_execute(initial_state, start_nodes, max_iterations)
+        while True:
+            try:
+                execution_log.append(next(entries))
+            except StopIteration as stop:
+                return stop.value, execution_log
+    
+    def iter_execute(
+        self,
+        initial_state: Dict[str, Any],
+        start_nodes: Optional[List[str]] = None,
+        max_iterations: int = 100
+    ) -> Generator[ExecutionEntry, None, Dict[str, Any]]:
+        """Execute the workflow graph, yielding each log entry as its node finishes.
+        
+        Callers that only need part of the log can consume entries as they arrive
+        instead of holding the whole run in memory. The final state is the
+        generator's return value (StopIteration.value).
+        
+        Args:
+            initial_state: Starting state for the workflow
+            start_nodes: Nodes to begin execution from (auto-detects entry nodes if None)
+            max_iterations: Safety limit to prevent infinite loops
+            
+        Yields:
+            ExecutionEntry for each executed node, in execution order
+        """
         if start_nodes is None:
-            # Auto-detect entry nodes (nodes with no incoming edges)
-            incoming = set()
-            for edges in self.edges.values():
-                for edge in edges:
-                    incoming.add(edge.target)
-            start_nodes = [name for name in self.nodes.keys() if name not in incoming]
+            if self._is_acyclic():
+                return (yield from self._compiled(initial_state, max_iterations))
+            start_nodes = self._get_entry_nodes()
         
         state = initial_state.copy()
-        execution_log: List[ExecutionEntry] = []
-        queue = list(start_nodes)
+        queue = deque(start_nodes)
         executed = set()
         iteration = 0
         
         while queue and iteration < max_iterations:
             iteration += 1
-            node_name = queue.pop(0)
+            node_name = queue.popleft()
             
             # Prevent infinite loops: skip re-execution after seeing all nodes
             if node_name in executed and iteration > len(self.nodes):
@@ -202,28 +605,217 @@ class Graph:
             if node_name not in self.nodes:
                 continue
             
-            node = self.nodes[node_name]
-            input_state = state.copy()
-            
-            # Execute the node and capture state transformation
-            state, error = node.execute(state)
-            
-            status = NodeStatus.ERROR if error else NodeStatus.SUCCESS
-            execution_log.append(ExecutionEntry(
-                node_name=node_name,
-                status=status,
-                input_state=input_state,
-                output_state=state,
-                error_message=error
-            ))
-            
+            state, entry = self._run_node(node_name, state)
+            yield entry
             executed.add(node_name)
             
             # Queue next nodes based on edge conditions
             next_nodes = self._get_next_nodes(node_name, state)
             queue.extend(next_nodes)
         
+        return state
+    
+    def execute_parallel(
+        self,
+        initial_state: Dict[str, Any],
+        pool: Executor,
+        max_iterations: int = 100
+    ) -> Tuple[Dict[str, Any], List[ExecutionEntry]]:
+        """Execute the workflow, running independent nodes concurrently on a pool.
+        
+        Acyclic graphs run in waves as described in aexecute; cyclic graphs fall back
+        to the sequential loop.
+        
+        Args:
+            initial_state: Starting state for the workflow
+            pool: Executor that node functions are submitted to
+            max_iterations: Maximum number of node executions
+            
+        Returns:
+            Tuple of (final_state, execution_log)
+        """
+        if not self._is_acyclic():
+            return self.execute(initial_state, max_iterations=max_iterations)
+        
+        state = initial_state.copy()
+        execution_log: List[ExecutionEntry] = []
+        indeg = dict(self._indeg)
+        frontier = list(self._get_entry_nodes())
+        activated = set(frontier)
+        iteration = 0
+        
+        while frontier and iteration < max_iterations:
+            wave = [name for name in frontier if name in activated][:max_iterations - iteration]
+            iteration += len(wave)
+            
+            snapshot = state
+            futures = [pool.submit(self.nodes[name].execute, snapshot) for name in wave]
+            wait(futures)
+            results = [future.result() for future in futures]
+            state = self._merge_wave(snapshot, wave, results, execution_log)
+            frontier = self._advance_wave(frontier, wave, results, indeg, activated)
+        
+        return state, execution_log
+    
+    async def aexecute(
+        self,
+        initial_state: Dict[str, Any],
+        max_iterations: int = 100,
+        executor: Optional[Executor] = None
+    ) -> Tuple[Dict[str, Any], List[ExecutionEntry]]:
+        """Execute the workflow without blocking the event loop.
+        
+        Acyclic graphs run in waves: every ready node of a wave is dispatched to the
+        executor concurrently, all reading the same state snapshot, and their
+        changes are merged before the next wave. Cyclic graphs run the sequential
+        loop in the executor.
+        
+        Args:
+            initial_state: Starting state for the workflow
+            max_iterations: Maximum number of node executions
+            executor: Executor to run nodes on (the loop's default executor if None)
+            
+        Returns:
+            Tuple of (final_state, execution_log)
+        """
+        loop = asyncio.get_running_loop()
+        if not self._is_acyclic():
+            return await loop.run_in_executor(executor, self.execute, initial_state, None, max_iterations)
+        
+        state = initial_state.copy()
+        execution_log: List[ExecutionEntry] = []
+        indeg = dict(self._indeg)
+        frontier = list(self._get_entry_nodes())
+        activated = set(frontier)
+        iteration = 0
+        
+        while frontier and iteration < max_iterations:
+            wave = [name for name in frontier if name in activated][:max_iterations - iteration]
+            iteration += len(wave)
+            
+            snapshot = state
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, self.nodes[name].execute, snapshot)
+                for name in wave
+            ))
+            state = self._merge_wave(snapshot, wave, results, execution_log)
+            frontier = self._advance_wave(frontier, wave, results, indeg, activated)
+        
         return state, execution_log
+    
+    def _release_successors(
+        self,
+        node_name: str,
+        taken: List[str],
+        indeg: Dict[str, int],
+        activated: Set[str]
+    ) -> List[str]:
+        """Mark a node as finished for topological scheduling.
+        
+        Args:
+            node_name: The node that just finished or was skipped
+            taken: Targets whose edge conditions passed (empty if the node was skipped)
+            indeg: Remaining in-degree per node, updated in place
+            activated: Nodes reached by at least one taken edge, updated in place
+            
+        Returns:
+            Successors that have no unfinished predecessors left
+        """
+        released = []
+        for edge in self.edges[node_name]:
+            target = edge.target
+            if target in taken:
+                activated.add(target)
+            indeg[target] -= 1
+            if indeg[target] == 0:
+                released.append(target)
+        return released
+    
+    def _advance_wave(
+        self,
+        frontier: List[str],
+        wave: List[str],
+        results: List[Tuple[Dict[str, Any], Optional[str]]],
+        indeg: Dict[str, int],
+        activated: Set[str]
+    ) -> List[str]:
+        """Release the successors of a finished wave and return the next frontier.
+        
+        Edge conditions of each executed node are evaluated against that node's own output.
+        """
+        outputs = {name: output for name, (output, _) in zip(wave, results)}
+        next_frontier: List[str] = []
+        for name in frontier:
+            taken = self._get_next_nodes(name, outputs[name]) if name in outputs else []
+            next_frontier.extend(self._release_successors(name, taken, indeg, activated))
+        return next_frontier
+    
+    def _merge_wave(
+        self,
+        snapshot: Dict[str, Any],
+        wave: List[str],
+        results: List[Tuple[Dict[str, Any], Optional[str]]],
+        execution_log: List[ExecutionEntry]
+    ) -> Dict[str, Any]:
+        """Log a wave of concurrently executed nodes and merge their output states.
+        
+        Each node's changes relative to the shared snapshot are applied in wave order,
+        so the last writer wins when nodes touch the same key. Values are compared by
+        equality, not identity: a node may return equal but new objects (e.g. a
+        memoized node's cached output) without undoing its siblings' writes.
+        
+        Returns:
+            The merged state
+        """
+        for name, (output, error) in zip(wave, results):
+            execution_log.append(ExecutionEntry(
+                node_name=name,
+                status=NodeStatus.ERROR if error else NodeStatus.SUCCESS,
+                input_state=snapshot,
+                output_state=output,
+                error_message=error
+            ))
+        
+        if len(wave) == 1:
+            return results[0][0]
+        
+        merged = dict(snapshot)
+        for output, _ in results:
+            if output is snapshot:
+                continue
+            for key, value in output.items():
+                if key not in snapshot or _changed(snapshot[key], value):
+                    merged[key] = value
+            for key in snapshot:
+                if key not in output:
+                    merged.pop(key, None)
+        return merged
+    
+    def _run_node(
+        self,
+        node_name: str,
+        state: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], ExecutionEntry]:
+        """Execute a single node and build its execution log entry.
+        
+        Args:
+            node_name: Name of the node to execute
+            state: Current workflow state
+            
+        Returns:
+            Tuple of (state produced by the node, log entry)
+        """
+        # Node.execute never mutates its argument, so no snapshot copy is needed
+        output_state, error = self.nodes[node_name].execute(state)
+        
+        entry = ExecutionEntry(
+            node_name=node_name,
+            status=NodeStatus.ERROR if error else NodeStatus.SUCCESS,
+            input_state=state,
+            output_state=output_state,
+            error_message=error
+        )
+        return output_state, entry
 
 
 class WorkflowEngine:
@@ -232,18 +824,25 @@ class WorkflowEngine:
     def __init__(self):
         """Initialize a workflow engine instance."""
         self.graphs: Dict[str, Graph] = {}
-        self.run_history: Dict[str, Tuple[Dict[str, Any], List[ExecutionEntry]]] = {}
+        # Bounded so that sustained traffic cannot grow memory without limit
+        self.run_history: LRUCache = LRUCache(maxsize=int(os.getenv("RUN_HISTORY_MAX", "1000")))
+        # LRUCache reorders on every read and may evict on writes; runs can record
+        # from several threads at once
+        self._history_lock = threading.Lock()
+        # Shared worker pool for running independent branches concurrently
+        self._pool = ThreadPoolExecutor()
     
-    def create_graph(self, name: str) -> Graph:
+    def create_graph(self, name: str, allow_cycles: bool = True) -> Graph:
         """Create and register a new workflow graph.
         
         Args:
             name: Human-readable name for the workflow
+            allow_cycles: Whether the workflow may contain intentional loops
             
         Returns:
             The newly created Graph object
         """
-        graph = Graph(name)
+        graph = Graph(name, allow_cycles)
         self.graphs[graph.id] = graph
         return graph
     
@@ -262,7 +861,8 @@ class WorkflowEngine:
         self,
         graph_id: str,
         initial_state: Dict[str, Any],
-        max_iterations: int = 100
+        max_iterations: int = 100,
+        parallel: bool = False
     ) -> Tuple[str, Dict[str, Any], List[ExecutionEntry]]:
         """Execute a workflow graph and record results.
         
@@ -270,6 +870,83 @@ class WorkflowEngine:
             graph_id: The identifier of the graph to execute
             initial_state: The starting state for the workflow
             max_iterations: Safety limit on iterations
+            parallel: Run independent branches concurrently on the engine's thread pool
+            
+        Returns:
+            Tuple of (run_id, final_state, execution_log)
+            
+        Raises:
+            ValueError: If graph_id is not found
+        """
+        graph = self.graphs.get(graph_id)
+        if not graph:
+            raise ValueError(f"Graph {graph_id} not found in engine")
+        
+        if parallel:
+            final_state, execution_log = graph.execute_parallel(initial_state, self._pool, max_iterations)
+        else:
+            final_state, execution_log = graph.execute(initial_state, max_iterations=max_iterations)
+        run_id = self._record_run(final_state, execution_log)
+        
+        return run_id, final_state, execution_log
+    
+    def run_graph_stream(
+        self,
+        graph_id: str,
+        initial_state: Dict[str, Any],
+        max_iterations: int = 100
+    ) -> Generator[Tuple[str, NodeStatus, Optional[str]], None, Tuple[str, Dict[str, Any]]]:
+        """Execute a workflow graph, yielding each node's result as it finishes.
+        
+        The per-node state snapshots are not retained: the run is recorded with its
+        final state and a log of outcomes whose input_state and output_state are
+        empty, so get_run_state still reports failed nodes. The generator's return
+        value (StopIteration.value) is (run_id, final_state).
+        
+        Args:
+            graph_id: The identifier of the graph to execute
+            initial_state: The starting state for the workflow
+            max_iterations: Safety limit on iterations
+        
+        Yields:
+            Tuple of (node_name, status, error_message) for each executed node
+        
+        Raises:
+            ValueError: If graph_id is not found
+        """
+        graph = self.graphs.get(graph_id)
+        if not graph:
+            raise ValueError(f"Graph {graph_id} not found in engine")
+        
+        outcomes: List[ExecutionEntry] = []
+        entries = graph.iter_execute(initial_state, max_iterations=max_iterations)
+        while True:
+            try:
+                entry = next(entries)
+            except StopIteration as stop:
+                final_state = stop.value
+                break
+            outcomes.append(ExecutionEntry(entry.node_name, entry.status, {}, {}, entry.error_message))
+            yield entry.node_name, entry.status, entry.error_message
+        run_id = self._record_run(final_state, outcomes)
+        
+        return run_id, final_state
+    
+    async def arun_graph(
+        self,
+        graph_id: str,
+        initial_state: Dict[str, Any],
+        max_iterations: int = 100,
+        parallel: bool = True
+    ) -> Tuple[str, Dict[str, Any], List[ExecutionEntry]]:
+        """Execute a workflow graph without blocking the event loop and record results.
+        
+        Args:
+            graph_id: The identifier of the graph to execute
+            initial_state: The starting state for the workflow
+            max_iterations: Safety limit on iterations
+            parallel: Run independent branches concurrently (see Graph.aexecute);
+                otherwise the sequential engine runs on the thread pool
             
         Returns:
             Tuple of (run_id, final_state, execution_log)
@@ -281,12 +958,24 @@ class WorkflowEngine:
         if not graph:
             raise ValueError(f"Graph {graph_id} not found in engine")
         
-        final_state, execution_log = graph.execute(initial_state, max_iterations=max_iterations)
-        run_id = str(uuid.uuid4())
-        self.run_history[run_id] = (final_state, execution_log)
+        if parallel:
+            final_state, execution_log = await graph.aexecute(initial_state, max_iterations, self._pool)
+        else:
+            loop = asyncio.get_running_loop()
+            final_state, execution_log = await loop.run_in_executor(
+                self._pool, graph.execute, initial_state, None, max_iterations
+            )
+        run_id = self._record_run(final_state, execution_log)
         
         return run_id, final_state, execution_log
     
+    def _record_run(self, final_state: Dict[str, Any], execution_log: List[ExecutionEntry]) -> str:
+        """Store the results of a run and return its new run ID."""
+        run_id = _fast_uuid()
+        with self._history_lock:
+            self.run_history[run_id] = (final_state, execution_log)
+        return run_id
+    
     def get_run_state(self, run_id: str) -> Optional[Tuple[Dict[str, Any], List[ExecutionEntry]]]:
         """Retrieve the results of a previous workflow execution.
         
@@ -296,4 +985,5 @@ class WorkflowEngine:
         Returns:
             Tuple of (final_state, execution_log) if found, None otherwise
         """
-        return self.run_history.get(run_id)
+        with self._history_lock:
+            return self.run_history.get(run_id)
@@ -1,7 +1,9 @@
 """FastAPI application entry point for the Workflow Engine."""
 
+import functools
+
 from fastapi import FastAPI, HTTPException, status
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List
 
 from app.schemas import (
     CreateGraphRequest,
@@ -11,7 +13,7 @@ from app.schemas import (
     GetStateResponse,
     ExecutionLog,
 )
-from app.engine import WorkflowEngine, NodeStatus
+from app.engine import ExecutionEntry, WorkflowEngine, NodeStatus
 
 
 # Initialize FastAPI app
@@ -25,8 +27,42 @@ app = FastAPI(
 engine = WorkflowEngine()
 
 
+@functools.lru_cache(maxsize=4096)
+def _compile_condition(cond_str: str) -> Callable[[Dict[str, Any]], bool]:
+    """Build an edge condition from a string such as "state['status'] == 'approved'".
+    
+    The string is compiled once per process; graphs that reuse the same condition
+    share the resulting callable.
+    """
+    code = compile(cond_str, "<edge-condition>", "eval")
+    
+    def cond(state: Dict[str, Any]) -> bool:
+        try:
+            return bool(eval(code, {"state": state}))
+        except Exception:
+            return False
+    return cond
+
+
+def _log_entries(execution_log: List[ExecutionEntry]) -> List[ExecutionLog]:
+    """Convert engine log entries to response models.
+    
+    The entries come from the engine rather than the client, so validation is skipped.
+    """
+    return [
+        ExecutionLog.model_construct(
+            node_name=entry.node_name,
+            status=entry.status.value,
+            input_state=entry.input_state,
+            output_state=entry.output_state,
+            error_message=entry.error_message,
+        )
+        for entry in execution_log
+    ]
+
+
 @app.get("/")
-async def root():
+async def root() -> Dict[str, str]:
     """Root endpoint."""
     return {
         "message": "LangGraph Workflow Engine",
@@ -64,18 +100,13 @@ async def create_graph(request: CreateGraphRequest) -> CreateGraphResponse:
         for edge_def in request.edges:
             condition = None
             if edge_def.condition:
-                # Parse simple condition strings (e.g., "status=='approved'")
-                def make_condition(cond_str: str):
-                    def cond(state: Dict[str, Any]) -> bool:
-                        try:
-                            return eval(cond_str, {"state": state})
-                        except Exception:
-                            return False
-                    return cond
-                condition = make_condition(edge_def.condition)
+                condition = _compile_condition(edge_def.condition)
             
             graph.add_edge(edge_def.source, edge_def.target, condition)
         
+        # Build the execution plan now rather than on the first run
+        graph.finalize()
+        
         return CreateGraphResponse(graph_id=graph.id)
     
     except Exception as e:
@@ -97,32 +128,21 @@ async def run_graph(request: RunGraphRequest) -> RunGraphResponse:
         Final state and execution log
     """
     try:
-        run_id, final_state, execution_log = engine.run_graph(
+        run_id, final_state, execution_log = await engine.arun_graph(
             request.graph_id,
             request.initial_state,
             request.max_iterations,
+            request.parallel,
         )
         
         # Determine overall status
         has_errors = any(entry.status == NodeStatus.ERROR for entry in execution_log)
         status_str = "error" if has_errors else "success"
         
-        # Convert execution log to response format
-        log_entries = [
-            ExecutionLog(
-                node_name=entry.node_name,
-                status=entry.status.value,
-                input_state=entry.input_state,
-                output_state=entry.output_state,
-                error_message=entry.error_message,
-            )
-            for entry in execution_log
-        ]
-        
-        return RunGraphResponse(
+        return RunGraphResponse.model_construct(
             run_id=run_id,
             final_state=final_state,
-            execution_log=log_entries,
+            execution_log=_log_entries(execution_log),
             status=status_str,
         )
     
@@ -159,27 +179,15 @@ async def get_state(run_id: str) -> GetStateResponse:
     
     final_state, execution_log = result
     
-    # Convert execution log to response format
-    log_entries = [
-        ExecutionLog(
-            node_name=entry.node_name,
-            status=entry.status.value,
-            input_state=entry.input_state,
-            output_state=entry.output_state,
-            error_message=entry.error_message,
-        )
-        for entry in execution_log
-    ]
-    
     # Determine status
     has_errors = any(entry.status == NodeStatus.ERROR for entry in execution_log)
     status_str = "error" if has_errors else "success"
     
-    return GetStateResponse(
+    return GetStateResponse.model_construct(
         run_id=run_id,
         graph_id="unknown",  # Would need to track this separately
         current_state=final_state,
-        execution_log=log_entries,
+        execution_log=_log_entries(execution_log),
         status=status_str,
     )
 
@@ -42,6 +42,7 @@ class RunGraphRequest(BaseModel):
     graph_id: str = Field(..., description="Graph identifier")
     initial_state: Dict[str, Any] = Field(default_factory=dict, description="Initial state dictionary")
     max_iterations: int = Field(default=100, ge=1, description="Maximum iterations for loops")
+    parallel: bool = Field(default=True, description="Run independent branches concurrently")
 
 
 class ExecutionLog(BaseModel):
@@ -1,7 +1,74 @@
 """Tool registry for helper functions that nodes can invoke."""
 
+import functools
+import json
+import logging
+import math
 from typing import Any, Callable, Dict, Optional
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def _jit_compile(func: Callable, signature: Optional[str] = None) -> Callable:
+    """
+    Compile a numeric tool with numba.njit, falling back to the Python function.
+    
+    numba is an optional dependency and is only imported here. With a signature
+    the function is compiled eagerly; otherwise compilation happens on the first
+    call, and a compilation failure then switches the tool back to plain Python.
+    
+    Args:
+        func: Tool function to compile
+        signature: Optional numba signature string, e.g. "float64(float64[:])"
+        
+    Returns:
+        The compiled function, or func if it cannot be compiled
+    """
+    try:
+        import numba
+        from numba.core import errors
+    except ImportError:
+        logger.warning("numba is not installed; tool %s runs as plain Python", func.__name__)
+        return func
+    
+    # UnsupportedBytecodeError (newer numba releases) does not derive from NumbaError
+    compile_errors = (errors.NumbaError, getattr(errors, "UnsupportedBytecodeError", errors.NumbaError))
+    
+    def njit(cache: bool) -> Callable:
+        if signature is not None:
+            return numba.njit(signature, cache=cache, fastmath=True)(func)
+        return numba.njit(cache=cache, fastmath=True)(func)
+    
+    try:
+        try:
+            compiled = njit(cache=True)
+        except RuntimeError:
+            # No on-disk cache location for functions without a source file
+            compiled = njit(cache=False)
+    except compile_errors as e:
+        logger.warning("Could not JIT-compile tool %s: %s", func.__name__, e)
+        return func
+    if signature is not None:
+        return compiled
+    
+    impl = compiled
+    
+    @functools.wraps(func)
+    def dispatch(*args: Any, **kwargs: Any) -> Any:
+        nonlocal impl
+        try:
+            return impl(*args, **kwargs)
+        except compile_errors as e:
+            if impl is func:
+                raise
+            logger.warning("Could not JIT-compile tool %s: %s", func.__name__, e)
+            impl = func
+            return func(*args, **kwargs)
+    
+    return dispatch
+
 
 class ToolRegistry:
     """Registry for managing tool functions that can be called from nodes."""
@@ -10,17 +77,21 @@ class ToolRegistry:
         """Initialize the tool registry."""
         self._tools: Dict[str, Callable] = {}
     
-    def register(self, name: str) -> Callable:
+    def register(self, name: str, jit: bool = False, signature: Optional[str] = None) -> Callable:
         """
         Decorator to register a tool function.
         
         Args:
             name: Unique identifier for the tool
+            jit: Compile the tool with numba.njit (numeric code only; requires numba)
+            signature: Optional numba signature for eager compilation when jit is set
             
         Returns:
             Decorator function
         """
         def decorator(func: Callable) -> Callable:
+            if jit:
+                func = _jit_compile(func, signature)
             self._tools[name] = func
             return func
         return decorator
@@ -69,27 +140,75 @@ tool_registry = ToolRegistry()
 # Example Tools (for sample workflows)
 # ============================================================================
 
+_POSITIVE_WORDS = frozenset({"good", "great", "excellent", "amazing", "wonderful"})
+_NEGATIVE_WORDS = frozenset({"bad", "terrible", "awful", "horrible", "poor"})
+
+
+def _build_sentiment_automaton() -> Optional[Any]:
+    """
+    Build an Aho-Corasick automaton over the sentiment words.
+    
+    Uses the optional pyahocorasick package; returns None if it is not installed.
+    Each word maps to (length, polarity) so matches can be boundary-checked.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in _POSITIVE_WORDS:
+        automaton.add_word(word, (len(word), 1))
+    for word in _NEGATIVE_WORDS:
+        automaton.add_word(word, (len(word), -1))
+    automaton.make_automaton()
+    return automaton
+
+
+_SENTIMENT_AUTOMATON = _build_sentiment_automaton()
+
+
 @tool_registry.register("extract_text")
 def extract_text(content: str, max_length: int = 500) -> str:
     """Extract text from content, limited to max_length."""
+    if len(content) <= max_length:
+        return content
     return content[:max_length]
 
 
+# Pure text tools are cached on their arguments; registering the cached function
+# means calls through tool_registry.call hit the cache as well
+
 @tool_registry.register("count_words")
+@functools.lru_cache(maxsize=4096)
 def count_words(text: str) -> int:
     """Count number of words in text."""
     return len(text.split())
 
 
 @tool_registry.register("analyze_sentiment")
+@functools.lru_cache(maxsize=4096)
 def analyze_sentiment(text: str) -> str:
     """Rule-based sentiment analysis (no ML)."""
-    positive_words = {"good", "great", "excellent", "amazing", "wonderful"}
-    negative_words = {"bad", "terrible", "awful", "horrible", "poor"}
-    
-    words = text.lower().split()
-    pos_count = sum(1 for w in words if w in positive_words)
-    neg_count = sum(1 for w in words if w in negative_words)
+    pos_count = 0
+    neg_count = 0
+    if _SENTIMENT_AUTOMATON is not None:
+        # One automaton pass; only hits that form a whole whitespace-separated
+        # word count, matching the split() path below
+        text = text.lower()
+        last = len(text) - 1
+        for end, (length, polarity) in _SENTIMENT_AUTOMATON.iter(text):
+            start = end - length + 1
+            if (start == 0 or text[start - 1].isspace()) and (end == last or text[end + 1].isspace()):
+                if polarity > 0:
+                    pos_count += 1
+                else:
+                    neg_count += 1
+    else:
+        for w in text.lower().split():
+            if w in _POSITIVE_WORDS:
+                pos_count += 1
+            elif w in _NEGATIVE_WORDS:
+                neg_count += 1
     
     if pos_count > neg_count:
         return "positive"
@@ -99,10 +218,36 @@ def analyze_sentiment(text: str) -> str:
         return "neutral"
 
 
+def _has_non_finite(value: Any) -> bool:
+    """Check whether value contains a NaN or infinite float, which orjson writes as null."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(map(_has_non_finite, value.keys())) or any(map(_has_non_finite, value.values()))
+    if isinstance(value, (list, tuple)):
+        if set(map(type, value)).isdisjoint((float, dict, list, tuple)):
+            # Common case of a list of strings or ints: no per-item Python calls
+            return False
+        return any(map(_has_non_finite, value))
+    return False
+
+
 @tool_registry.register("format_output")
 def format_output(data: Any, format_type: str = "json") -> str:
-    """Format data to specified format type."""
+    """
+    Format data to specified format type.
+    
+    JSON output parses to the same data as json.dumps(data, indent=2) but is not
+    byte-identical: non-ASCII text is written as UTF-8 instead of \\u escapes, and
+    floats use the shortest exponent form (1e16 rather than 1e+16). Data with NaN
+    or infinite floats is formatted by json, so they stay NaN and Infinity.
+    """
     if format_type == "json":
-        import json
+        if not _has_non_finite(data):
+            try:
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+            except TypeError:
+                # orjson rejects some values json accepts, e.g. integers beyond 64 bits
+                pass
         return json.dumps(data, indent=2)
     return str(data)
@@ -1,8 +1,62 @@
 """Sample Code Review Workflow (Option A)."""
 
-from typing import Dict, Any
+import functools
+from typing import Dict, Any, NamedTuple, Tuple
 from app.tools import tool_registry
 
+# Every byte except "(", ")", "{" and "}", deleted before the balance scan. UTF-8
+# multi-byte sequences never contain ASCII bytes, so encoded text filters safely
+_NON_BRACKET_BYTES = bytes(b for b in range(256) if b not in b"(){}")
+
+
+class _CodeScan(NamedTuple):
+    """Facts about a code snippet shared by the syntax and style checks."""
+    parens_ok: bool
+    braces_ok: bool
+    long_lines: Tuple[int, ...]
+    has_double_under: bool
+
+
+def _bracket_balance(code: str) -> Tuple[bool, bool]:
+    """Check parentheses and braces for balance and ordering in one pass.
+    
+    Returns:
+        Tuple of (parens_ok, braces_ok); a closer seen before its opener,
+        e.g. ")(", counts as unbalanced
+    """
+    paren = brace = 0
+    paren_ok = brace_ok = True
+    brackets = code.encode("utf-8", "surrogatepass").translate(None, _NON_BRACKET_BYTES)
+    for b in brackets:
+        if b == 40:  # "("
+            paren += 1
+        elif b == 41:  # ")"
+            paren -= 1
+            if paren < 0:
+                paren_ok = False
+        elif b == 123:  # "{"
+            brace += 1
+        else:
+            brace -= 1
+            if brace < 0:
+                brace_ok = False
+    return paren_ok and paren == 0, brace_ok and brace == 0
+
+
+@functools.lru_cache(maxsize=256)
+def _scan_code(code: str) -> _CodeScan:
+    """Scan a snippet once for everything check_syntax and analyze_style need.
+    
+    Both nodes run on the same extracted code, so the second call is a cache hit.
+    extract_code caps snippets at extract_text's default of 500 characters, so
+    the scan only ever sees short inputs.
+    """
+    parens_ok, braces_ok = _bracket_balance(code)
+    long_lines = tuple(
+        i + 1 for i, line in enumerate(code.split("\n")) if len(line) > 100
+    )
+    return _CodeScan(parens_ok, braces_ok, long_lines, "__" in code)
+
 
 def extract_code(state: Dict[str, Any]) -> Dict[str, Any]:
     """Extract code snippet from input."""
@@ -18,11 +72,12 @@ def check_syntax(state: Dict[str, Any]) -> Dict[str, Any]:
     # Simple rule-based checks
     issues = []
     
-    if "{" in code and "}" not in code:
+    scan = _scan_code(code)
+    if not scan.braces_ok:
         issues.append("Unmatched braces")
-    if code.count("(") != code.count(")"):
+    if not scan.parens_ok:
         issues.append("Unmatched parentheses")
-    if "import" in code and len(code.split("import")) > 5:
+    if code.count("import") >= 5:
         issues.append("Too many imports")
     
     state["syntax_issues"] = issues
@@ -35,16 +90,13 @@ def analyze_style(state: Dict[str, Any]) -> Dict[str, Any]:
     """Rule-based style analysis."""
     code = state.get("extracted_code", "")
     
-    warnings = []
+    scan = _scan_code(code)
     
     # Check line length
-    lines = code.split("\n")
-    for i, line in enumerate(lines):
-        if len(line) > 100:
-            warnings.append(f"Line {i+1}: exceeds 100 characters")
+    warnings = [f"Line {lineno}: exceeds 100 characters" for lineno in scan.long_lines]
     
     # Check naming conventions
-    if "_" * 2 in code:
+    if scan.has_double_under:
         warnings.append("Potential dunder usage without context")
     
     state["style_warnings"] = warnings
@@ -54,17 +106,19 @@ def analyze_style(state: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def generate_report(state: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate code review report."""
-    report = {
-        "syntax_issues": state.get("syntax_issues", []),
+    """Generate code review report.
+    
+    Always reached after check_syntax, so its results are indexed directly. When
+    syntax fails the workflow skips analyze_style, so style results may be absent.
+    """
+    state["review_report"] = {
+        "syntax_issues": state["syntax_issues"],
         "style_warnings": state.get("style_warnings", []),
         "passed_checks": {
-            "syntax": state.get("syntax_passed", False),
+            "syntax": state["syntax_passed"],
             "style": state.get("style_passed", False),
         },
     }
-    
-    state["review_report"] = report
     state["review_complete"] = True
     
     return state
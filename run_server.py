@@ -6,7 +6,6 @@ Then in another terminal: py test_live_server.py
 Or use curl commands as shown in the README
 """
 
-import sys
 import subprocess
 import time
 
@@ -18,8 +17,6 @@ if __name__ == "__main__":
     print("API docs available at http://localhost:8000/docs")
     print("\nPress Ctrl+C to stop the server\n")
     
-    sys.path.insert(0, r"c:\Projects\LangGraph")
-    
     import uvicorn
     from app.main import app
     
@@ -2,94 +2,140 @@
 
 import sys
 import json
-sys.path.insert(0, r"c:\Projects\LangGraph")
+import asyncio
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 
-client = TestClient(app)
 
+GRAPH_REQUEST = {
+    "name": "TestGraph",
+    "nodes": [
+        {"name": "node_a", "type": "task"},
+        {"name": "node_b", "type": "task"},
+        {"name": "node_c", "type": "task"},
+    ],
+    "edges": [
+        {"source": "node_a", "target": "node_b"},
+        {"source": "node_b", "target": "node_c"},
+    ],
+}
 
-def test_api():
-    """Test all API endpoints."""
-    print("=" * 60)
-    print("Testing FastAPI Endpoints")
-    print("=" * 60)
-    
-    # Test 1: Root endpoint
-    print("\n1. Testing GET /")
+
+@pytest.fixture(scope="module")
+def client():
+    """One TestClient shared by every test in this module."""
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def graph_id(client):
+    """ID of a graph created once for the module."""
+    response = client.post("/graph/create", json=GRAPH_REQUEST)
+    assert response.status_code == 200
+    return response.json()["graph_id"]
+
+
+@pytest.fixture(scope="module")
+def run_id(client, graph_id):
+    """ID of a completed run of the module graph."""
+    response = client.post("/graph/run", json={"graph_id": graph_id, "initial_state": {"input_value": 42}})
+    assert response.status_code == 200
+    return response.json()["run_id"]
+
+
+def test_root(client):
+    """Test GET /."""
     response = client.get("/")
-    print(f"   Status: {response.status_code}")
     print(f"   Response: {json.dumps(response.json(), indent=2)}")
     assert response.status_code == 200
-    
-    # Test 2: Create graph
-    print("\n2. Testing POST /graph/create")
-    create_request = {
-        "name": "TestGraph",
-        "nodes": [
-            {"name": "node_a", "type": "task"},
-            {"name": "node_b", "type": "task"},
-            {"name": "node_c", "type": "task"},
-        ],
-        "edges": [
-            {"source": "node_a", "target": "node_b"},
-            {"source": "node_b", "target": "node_c"},
-        ],
-    }
-    response = client.post("/graph/create", json=create_request)
-    print(f"   Status: {response.status_code}")
+
+
+def test_create_graph(client):
+    """Test POST /graph/create."""
+    response = client.post("/graph/create", json=GRAPH_REQUEST)
     resp_data = response.json()
     print(f"   Response: {json.dumps(resp_data, indent=2)}")
     assert response.status_code == 200
-    graph_id = resp_data["graph_id"]
-    
-    # Test 3: Run graph
-    print("\n3. Testing POST /graph/run")
+    assert resp_data["graph_id"]
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_run_graph(client, graph_id, parallel):
+    """Test POST /graph/run with and without concurrent branch execution."""
     run_request = {
         "graph_id": graph_id,
         "initial_state": {"input_value": 42},
         "max_iterations": 100,
+        "parallel": parallel,
     }
     response = client.post("/graph/run", json=run_request)
-    print(f"   Status: {response.status_code}")
     resp_data = response.json()
-    print(f"   Response structure:")
     print(f"     - run_id: {resp_data['run_id']}")
     print(f"     - status: {resp_data['status']}")
     print(f"     - nodes executed: {len(resp_data['execution_log'])}")
     print(f"     - final_state keys: {list(resp_data['final_state'].keys())}")
     assert response.status_code == 200
-    run_id = resp_data["run_id"]
-    
-    # Test 4: Get state
-    print("\n4. Testing GET /graph/state/{run_id}")
+    assert resp_data["status"] == "success"
+    assert [entry["node_name"] for entry in resp_data["execution_log"]] == ["node_a", "node_b", "node_c"]
+
+
+@pytest.mark.parametrize("condition, taken", [
+    ("len(state) > 0", True),
+    ("any(key.endswith('_executed') for key in state)", True),
+    ("isinstance(state.get('input_value'), int) and state['input_value'] > 100", False),
+    ("sum(sorted([state['input_value'], 1])) == 43", True),
+    ("round(state['input_value'] / 10) == 4 and hasattr(state, 'get')", True),
+])
+def test_run_graph_condition_builtins(client, condition, taken):
+    """Test that edge conditions may call builtins."""
+    graph_request = {
+        "name": "ConditionGraph",
+        "nodes": [{"name": "node_a", "type": "task"}, {"name": "node_b", "type": "task"}],
+        "edges": [{"source": "node_a", "target": "node_b", "condition": condition}],
+    }
+    graph_id = client.post("/graph/create", json=graph_request).json()["graph_id"]
+    response = client.post("/graph/run", json={"graph_id": graph_id, "initial_state": {"input_value": 42}})
+    resp_data = response.json()
+    assert response.status_code == 200
+    assert ("node_b_executed" in resp_data["final_state"]) == taken
+
+
+def test_get_state(client, run_id):
+    """Test GET /graph/state/{run_id}."""
     response = client.get(f"/graph/state/{run_id}")
-    print(f"   Status: {response.status_code}")
     resp_data = response.json()
-    print(f"   Response structure:")
-    print(f"     - run_id: {resp_data['run_id']}")
     print(f"     - status: {resp_data['status']}")
     print(f"     - current_state keys: {list(resp_data['current_state'].keys())}")
     assert response.status_code == 200
-    
-    # Test 5: Test invalid run_id
-    print("\n5. Testing GET /graph/state/{run_id} with invalid ID")
-    response = client.get("/graph/state/invalid_id")
-    print(f"   Status: {response.status_code}")
-    print(f"   Expected 404: {response.status_code == 404}")
+    assert resp_data["run_id"] == run_id
+
+
+@pytest.mark.parametrize("missing_run_id", ["invalid_id", "00000000-0000-0000-0000-000000000000"])
+def test_get_state_not_found(client, missing_run_id):
+    """Test GET /graph/state/{run_id} with an unknown ID."""
+    response = client.get(f"/graph/state/{missing_run_id}")
     assert response.status_code == 404
+
+
+def test_concurrent_runs(graph_id):
+    """Test that concurrent POST /graph/run requests each get their own run."""
+    async def run_many(n):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(*(
+                async_client.post("/graph/run", json={"graph_id": graph_id, "initial_state": {"i": i}})
+                for i in range(n)
+            ))
+    
+    responses = asyncio.run(run_many(20))
     
-    print("\n" + "=" * 60)
-    print("✓ All API tests passed!")
-    print("=" * 60)
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.json()["run_id"] for response in responses}) == 20
+    assert sorted(response.json()["final_state"]["i"] for response in responses) == list(range(20))
 
 
 if __name__ == "__main__":
-    try:
-        test_api()
-    except Exception as e:
-        print(f"\nX Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
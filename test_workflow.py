@@ -1,13 +1,17 @@
 """Simple test script to verify the workflow engine works."""
 
 import sys
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
-# Add the project root to the path so we can import app module
-sys.path.insert(0, r"c:\Projects\LangGraph")
+import pytest
+from cachetools import LRUCache
 
 # Import the engine and workflow
-from app.engine import WorkflowEngine
+from app.engine import NodeStatus, WorkflowEngine
+from app.tools import ToolRegistry, format_output
 from app.workflows.code_review import (
     extract_code,
     check_syntax,
@@ -39,7 +43,9 @@ def test_code_review_workflow():
     
     # Add edges with conditions
     graph.add_edge("extract", "check_syntax")
-    graph.add_edge("check_syntax", "analyze_style")
+    # Style analysis is wasted work once syntax has failed; report straight away
+    graph.add_edge("check_syntax", "analyze_style", condition=lambda s: s.get("syntax_passed", False))
+    graph.add_edge("check_syntax", "generate_report", condition=lambda s: not s.get("syntax_passed", True))
     graph.add_edge("analyze_style", "generate_report", condition=should_generate_report)
     print("✓ Added edges with branching logic")
     
@@ -54,22 +60,27 @@ def hello_world():
         "code_content": test_code,
     }
     
-    # Execute the graph
+    # Execute the graph, printing the log as each node finishes
     print("\nExecuting workflow...")
-    run_id, final_state, execution_log = engine.run_graph(graph.id, initial_state)
+    print("\nExecution Log:")
+    print("-" * 60)
+    stream = engine.run_graph_stream(graph.id, initial_state)
+    nodes_executed = 0
+    while True:
+        try:
+            node_name, status, error_message = next(stream)
+        except StopIteration as stop:
+            run_id, final_state = stop.value
+            break
+        nodes_executed += 1
+        status_symbol = "✓" if status.value == "success" else "✗"
+        print(f"{nodes_executed}. {status_symbol} {node_name}: {status.value}")
+        if error_message:
+            print(f"   Error: {error_message}")
     
     print(f"\n✓ Execution completed!")
     print(f"  Run ID: {run_id}")
-    print(f"  Nodes executed: {len(execution_log)}")
-    
-    # Print execution log
-    print("\nExecution Log:")
-    print("-" * 60)
-    for i, entry in enumerate(execution_log, 1):
-        status_symbol = "✓" if entry.status.value == "success" else "✗"
-        print(f"{i}. {status_symbol} {entry.node_name}: {entry.status.value}")
-        if entry.error_message:
-            print(f"   Error: {entry.error_message}")
+    print(f"  Nodes executed: {nodes_executed}")
     
     # Print final state
     print("\nFinal State:")
@@ -93,6 +104,341 @@ def hello_world():
     print("=" * 60)
 
 
+def test_syntax_failure_skips_style_analysis():
+    """Test that a syntax failure goes straight to the report without analyzing style."""
+    engine = WorkflowEngine()
+    graph = engine.create_graph("CodeReview")
+    graph.add_node("extract", extract_code)
+    graph.add_node("check_syntax", check_syntax)
+    graph.add_node("analyze_style", analyze_style)
+    graph.add_node("generate_report", generate_report)
+    graph.add_edge("extract", "check_syntax")
+    graph.add_edge("check_syntax", "analyze_style", condition=lambda s: s.get("syntax_passed", False))
+    graph.add_edge("check_syntax", "generate_report", condition=lambda s: not s.get("syntax_passed", True))
+    graph.add_edge("analyze_style", "generate_report", condition=should_generate_report)
+    
+    _, final_state, execution_log = engine.run_graph(graph.id, {"code_content": "def broken(:\n    pass\n"})
+    
+    assert [entry.node_name for entry in execution_log] == ["extract", "check_syntax", "generate_report"]
+    assert final_state["review_report"]["passed_checks"] == {"syntax": False, "style": False}
+
+
+def test_streamed_run_records_failures():
+    """Test that a streamed run yields each outcome and records failed nodes."""
+    def fail(state: Dict[str, Any]) -> Dict[str, Any]:
+        raise RuntimeError("boom")
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Stream")
+    graph.add_node("start", lambda state: state)
+    graph.add_node("fail", fail)
+    graph.add_edge("start", "fail")
+    
+    stream = engine.run_graph_stream(graph.id, {"input": 1})
+    outcomes = []
+    while True:
+        try:
+            outcomes.append(next(stream))
+        except StopIteration as stop:
+            run_id, final_state = stop.value
+            break
+    
+    assert [(name, status.value) for name, status, _ in outcomes] == [("start", "success"), ("fail", "error")]
+    assert "boom" in outcomes[1][2]
+    recorded_state, recorded_log = engine.get_run_state(run_id)
+    assert recorded_state == final_state
+    assert [entry.status.value for entry in recorded_log] == ["success", "error"]
+
+
+def test_branching_join_runs_once():
+    """Test that a node reached by several branches runs once, after all of them."""
+    def record(name):
+        def func(state: Dict[str, Any]) -> Dict[str, Any]:
+            state["order"] = state.get("order", []) + [name]
+            return state
+        return func
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Diamond")
+    for name in ("start", "left", "right", "join", "never"):
+        graph.add_node(name, record(name))
+    graph.add_edge("start", "left")
+    graph.add_edge("start", "right")
+    graph.add_edge("left", "join")
+    graph.add_edge("right", "join")
+    graph.add_edge("join", "never", condition=lambda state: False)
+    
+    _, final_state, execution_log = engine.run_graph(graph.id, {})
+    
+    assert final_state["order"] == ["start", "left", "right", "join"]
+    assert len(execution_log) == 4
+
+
+def test_empty_graph_returns_initial_state():
+    """Test that a graph without nodes runs nothing and returns the initial state."""
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Empty")
+    
+    _, final_state, execution_log = engine.run_graph(graph.id, {"input": 1})
+    
+    assert final_state == {"input": 1}
+    assert execution_log == []
+
+
+def test_async_branches_merge_state():
+    """Test that concurrently executed branches each contribute their state changes."""
+    def set_flag(key):
+        def func(state: Dict[str, Any]) -> Dict[str, Any]:
+            state[key] = True
+            return state
+        return func
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Fanout")
+    for name in ("start", "left", "right", "join"):
+        graph.add_node(name, set_flag(name))
+    graph.add_edge("start", "left")
+    graph.add_edge("start", "right")
+    graph.add_edge("left", "join")
+    graph.add_edge("right", "join")
+    
+    _, final_state, execution_log = asyncio.run(engine.arun_graph(graph.id, {"input": 1}))
+    
+    assert final_state == {"input": 1, "start": True, "left": True, "right": True, "join": True}
+    assert [entry.node_name for entry in execution_log] == ["start", "left", "right", "join"]
+
+
+def test_in_place_writes_are_kept():
+    """Test that every way of mutating the state in place reaches the final state."""
+    def merge(state: Dict[str, Any]) -> Dict[str, Any]:
+        state |= {"merged": True}
+        return state
+    
+    def update(state: Dict[str, Any]) -> Dict[str, Any]:
+        state.update(updated=True)
+        return state
+    
+    def pop(state: Dict[str, Any]) -> Dict[str, Any]:
+        state.pop("scratch")
+        return state
+    
+    def read(state: Dict[str, Any]) -> Dict[str, Any]:
+        assert state["merged"] and state["updated"]
+        return state
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("InPlace")
+    for name, func in (("merge", merge), ("update", update), ("pop", pop), ("read", read)):
+        graph.add_node(name, func)
+    graph.add_edge("merge", "update")
+    graph.add_edge("update", "pop")
+    graph.add_edge("pop", "read")
+    
+    initial_state = {"scratch": 0}
+    _, final_state, execution_log = engine.run_graph(graph.id, initial_state)
+    
+    assert [entry.status.value for entry in execution_log] == ["success"] * 4
+    assert final_state == {"merged": True, "updated": True}
+    assert initial_state == {"scratch": 0}
+
+
+def test_parallel_merge_keeps_writes_next_to_memoized_branch():
+    """Test that a memoized branch's cached output does not undo a sibling's write."""
+    def change_text(state: Dict[str, Any]) -> Dict[str, Any]:
+        state["text"] = "changed"
+        return state
+    
+    def count_words(state: Dict[str, Any]) -> Dict[str, Any]:
+        state["words"] = 2
+        return state
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Fanout")
+    graph.add_node("start", lambda state: state)
+    graph.add_node("change_text", change_text)
+    graph.add_node("count_words", count_words, memoize=True)
+    graph.add_edge("start", "change_text")
+    graph.add_edge("start", "count_words")
+    
+    for _ in range(2):
+        _, final_state, _ = engine.run_graph(graph.id, {"text": "hello world"}, parallel=True)
+        assert final_state == {"text": "changed", "words": 2}
+
+
+def test_run_history_from_many_threads():
+    """Test that runs recorded and read from several threads keep the history bounded."""
+    engine = WorkflowEngine()
+    engine.run_history = LRUCache(maxsize=16)
+    graph = engine.create_graph("Threads")
+    graph.add_node("start", lambda state: state)
+    
+    def run_and_read(i):
+        run_id = engine.run_graph(graph.id, {"i": i})[0]
+        engine.get_run_state(run_id)
+        return run_id
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        run_ids = list(pool.map(run_and_read, range(400)))
+    
+    assert len(set(run_ids)) == 400
+    assert len(engine.run_history) == 16
+
+
+def test_memoized_node_reuses_output():
+    """Test that a memoized node runs once per distinct input state."""
+    calls = []
+    
+    def double(state: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(state["value"])
+        state["doubled"] = state["value"] * 2
+        return state
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Memoized")
+    graph.add_node("double", double, memoize=True)
+    
+    results = [engine.run_graph(graph.id, {"value": value})[1] for value in (3, 3, 4)]
+    
+    assert [state["doubled"] for state in results] == [6, 6, 8]
+    assert calls == [3, 4]
+
+
+def test_jit_tool_compiles_numeric_code():
+    """Test that a numeric tool registered with jit=True is compiled by numba."""
+    numba = pytest.importorskip("numba")
+    np = pytest.importorskip("numpy")
+    registry = ToolRegistry()
+    
+    @registry.register("total", jit=True, signature="float64(float64[:])")
+    def total(values):
+        result = 0.0
+        for value in values:
+            result += value
+        return result
+    
+    assert isinstance(total, numba.core.registry.CPUDispatcher)
+    assert registry.call("total", np.array([1.0, 2.0, 3.5])) == 6.5
+
+
+def _first_key(mapping):
+    """Tool numba cannot type: a dict of arbitrary Python objects."""
+    return sorted(mapping)[0]
+
+
+def _uses_import(value):
+    """Tool numba cannot compile: an import statement in the body."""
+    import math
+    return math.floor(value)
+
+
+@pytest.mark.parametrize("func, arg, expected", [
+    (_first_key, {"b": object(), "a": object()}, "a"),
+    (_uses_import, 2.5, 2),
+])
+def test_jit_tool_falls_back_to_python(func, arg, expected):
+    """Test that a tool numba cannot compile still runs as plain Python."""
+    pytest.importorskip("numba")
+    registry = ToolRegistry()
+    registry.register("tool", jit=True)(func)
+    
+    assert registry.call("tool", arg) == expected
+    assert registry.call("tool", arg) == expected
+
+
+def test_memoized_node_after_writing_node():
+    """Test that a memoized node still hits the cache when an upstream node wrote the state."""
+    calls = []
+    
+    def prep(state: Dict[str, Any]) -> Dict[str, Any]:
+        state["prepared"] = True
+        return state
+    
+    def heavy(state: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(state["value"])
+        state["result"] = state["value"] + 1
+        return state
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Memoized")
+    graph.add_node("prep", prep)
+    graph.add_node("heavy", heavy, memoize=True)
+    graph.add_edge("prep", "heavy")
+    
+    results = [engine.run_graph(graph.id, {"value": 1})[1] for _ in range(3)]
+    
+    assert [state["result"] for state in results] == [2, 2, 2]
+    assert calls == [1]
+
+
+def test_memoized_output_is_not_shared_between_runs():
+    """Test that changing a nested value of a cached output does not alter later hits."""
+    def make_items(state: Dict[str, Any]) -> Dict[str, Any]:
+        state["items"] = ["a"]
+        return state
+    
+    def append_item(state: Dict[str, Any]) -> Dict[str, Any]:
+        state["items"].append("b")
+        return state
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Memoized")
+    graph.add_node("make_items", make_items, memoize=True)
+    graph.add_node("append_item", append_item)
+    graph.add_edge("make_items", "append_item")
+    
+    results = [engine.run_graph(graph.id, {"seed": "nested"})[1] for _ in range(3)]
+    
+    assert [state["items"] for state in results] == [["a", "b"]] * 3
+
+
+def test_memoized_node_skips_non_json_state():
+    """Test that values orjson would encode alike never share a cached output."""
+    calls = []
+    
+    def describe(state: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(state["value"])
+        state["kind"] = type(state["value"]).__name__
+        return state
+    
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Memoized")
+    graph.add_node("describe", describe, memoize=True)
+    
+    values = ((1, 2), [1, 2], NodeStatus.SUCCESS, "success", float("nan"), None)
+    results = [engine.run_graph(graph.id, {"value": value})[1] for value in values]
+    
+    assert [state["kind"] for state in results] == ["tuple", "list", "NodeStatus", "str", "float", "NoneType"]
+    assert len(calls) == len(values)
+
+
+def test_format_output_matches_json():
+    """Test that format_output produces the data json.dumps would, and keeps NaN."""
+    data = {1: "café", "nested": {"items": [1, 2.5, None, True]}, "tuple": (3, 4)}
+    
+    formatted = format_output(data)
+    
+    assert json.loads(formatted) == json.loads(json.dumps(data, indent=2))
+    assert '"1": "café"' in formatted
+    assert format_output({"ratio": float("nan"), "limit": [float("inf")]}) == json.dumps(
+        {"ratio": float("nan"), "limit": [float("inf")]}, indent=2
+    )
+
+
+def test_unintended_cycle_is_reported():
+    """Test that cycle detection names the loop and rejects it when cycles are disallowed."""
+    engine = WorkflowEngine()
+    graph = engine.create_graph("Loop", allow_cycles=False)
+    for name in ("start", "retry", "check"):
+        graph.add_node(name, lambda state: state)
+    graph.add_edge("start", "retry")
+    graph.add_edge("retry", "check")
+    graph.add_edge("check", "retry")
+    
+    assert graph.sort_or_cycle() == ([], ["retry", "check", "retry"])
+    with pytest.raises(ValueError, match="retry -> check -> retry"):
+        engine.run_graph(graph.id, {})
+
+
 if __name__ == "__main__":
     try:
         test_code_review_workflow()